@@ -1,6 +1,8 @@
 """
 Command line entrypoint
 """
+import logging
+import sys
 from typing import List, Optional, Union
 
 import fire
@@ -8,22 +10,60 @@ import fire
 from .dag import DagExecutor
 
 
+logger = logging.getLogger(__name__)
+
+
 def plan_apply_dag(scripts: Union[str, List[str]],
                    data: str,
                    output: Optional[str] = None,
-                   use_dask: bool = False):
+                   use_dask: bool = False,
+                   checkpoint_dir: Optional[str] = None,
+                   resume: bool = False,
+                   max_retries: int = 0):
     """ Plan and execute a dag from a script """
-    executor = (DagExecutor(use_dask=use_dask)
+    executor = (DagExecutor(use_dask=use_dask,
+                            checkpoint_dir=checkpoint_dir,
+                            max_retries=max_retries)
                 .add_function_scripts(scripts)
                 .plan()
     )
-    result = executor.apply(data)
+    result = executor.apply(data, resume=resume)
     if not output:
         return result
     else:
         result.to_parquet(output)
 
 
+def serve_dag(scripts: Union[str, List[str]],
+              host: Optional[str] = None,
+              port: Optional[int] = None,
+              n_workers: int = 1,
+              max_batch_size: int = 1,
+              batch_timeout: float = 0.01,
+              request_timeout: Optional[float] = None):
+    """ Plan a dag from a script once, and serve it over HTTP until interrupted """
+    from .server import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_REQUEST_TIMEOUT, DagServer
+
+    logging.basicConfig(level=logging.INFO)
+    server = DagServer(scripts,
+                       host=host or DEFAULT_HOST,
+                       port=DEFAULT_PORT if port is None else port,
+                       n_workers=n_workers,
+                       max_batch_size=max_batch_size,
+                       batch_timeout=batch_timeout,
+                       request_timeout=request_timeout or DEFAULT_REQUEST_TIMEOUT)
+    logger.info(f'Serving dag at {server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 def main():
     """ Convert to CLI """
-    fire.Fire(plan_apply_dag)
+    if sys.argv[1:2] == ['serve']:
+        fire.Fire(serve_dag, command=sys.argv[2:])
+    else:
+        fire.Fire(plan_apply_dag)
@@ -0,0 +1,135 @@
+"""
+Persist computed columns during DAG execution, enabling resumption of failed runs
+"""
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, List, Set, Union
+
+import pandas as pd
+
+
+RUN_DIR_NAME = '.dagger_run'
+MANIFEST_NAME = 'manifest.json'
+COLUMN_SUFFIX = '.parquet'
+FALLBACK_SUFFIX = '.pkl'
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint_data(data: pd.DataFrame, columns: Iterable[str]) -> str:
+    """ Hash the values, index and row order of :columns: of data, identifying the input of a run """
+    row_hashes = pd.util.hash_pandas_object(data[sorted(columns)], index=True).values
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+class CheckpointStore:
+    """
+    A directory of per-column parquet files along with a run manifest
+
+    Columns which can't be written as parquet (e.g. mixed-type object columns) are
+    pickled instead. Columns which can't be persisted at all are not checkpointed, and
+    are recomputed on resumption.
+
+    Files are written to a dedicated subdirectory of :path:, so that other files in
+    :path: are never touched. The manifest records the execution plan of the run, a
+    fingerprint of the input data, and which nodes have been completed. Columns are always
+    written before the manifest is updated, so a node listed as complete is guaranteed to
+    have been persisted.
+
+    Usage:
+    ------
+    store = CheckpointStore('path/to/checkpoints/')
+    store.start(plan, fingerprint)
+    store.save('var1', data['var1'])
+    store.load('var1')
+    """
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.run_path = self.path / RUN_DIR_NAME
+        self._manifest = None
+
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.run_path / MANIFEST_NAME
+
+
+    def _column_path(self, nm: str, suffix: str = COLUMN_SUFFIX) -> Path:
+        return self.run_path / f'{nm}{suffix}'
+
+
+    def _write_manifest(self):
+        """ Atomically overwrite the manifest with the current state """
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+
+    def _read_manifest(self) -> dict:
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+
+    def start(self, plan: List[str], fingerprint: str):
+        """ Begin a fresh run, discarding any columns checkpointed by a previous run """
+        self.run_path.mkdir(parents=True, exist_ok=True)
+        if self.exists():
+            for nm in self._read_manifest()['completed']:
+                for suffix in (COLUMN_SUFFIX, FALLBACK_SUFFIX):
+                    self._column_path(nm, suffix).unlink(missing_ok=True)
+        self._manifest = {'plan': list(plan), 'fingerprint': fingerprint, 'completed': []}
+        self._write_manifest()
+
+
+    def resume(self, plan: List[str], fingerprint: str) -> Set[str]:
+        """ Reopen an existing run, returning names of completed nodes
+
+        Starts a fresh run if no manifest exists """
+        if not self.exists():
+            logger.info(f'No checkpoint found at {self.path}. Starting fresh run...')
+            self.start(plan, fingerprint)
+            return set()
+
+        manifest = self._read_manifest()
+        if manifest['plan'] != list(plan):
+            raise ValueError(f'Checkpoint at {self.path} was created with a different plan: '
+                             f'{manifest["plan"]}')
+        if manifest['fingerprint'] != fingerprint:
+            raise ValueError(f'Checkpoint at {self.path} was created with different input data')
+        self._manifest = manifest
+        return set(manifest['completed'])
+
+
+    def save(self, nm: str, value: pd.Series):
+        """ Persist a computed column and mark its node as complete """
+        if self._manifest is None:
+            raise ValueError('Must first run .start() or .resume()')
+        frame = value.rename(nm).to_frame()
+        try:
+            frame.to_parquet(self._column_path(nm))
+        except Exception as e:
+            self._column_path(nm).unlink(missing_ok=True)
+            logger.info(f'Could not write column {nm} as parquet ({e!r}). Pickling instead...')
+            try:
+                frame.to_pickle(self._column_path(nm, FALLBACK_SUFFIX))
+            except Exception as e:
+                self._column_path(nm, FALLBACK_SUFFIX).unlink(missing_ok=True)
+                logger.warning(f'Could not checkpoint column {nm} ({e!r}). Skipping...')
+                return
+        self._manifest['completed'].append(nm)
+        self._write_manifest()
+
+
+    def load(self, nm: str) -> pd.Series:
+        """ Load a previously persisted column """
+        if (fallback_path := self._column_path(nm, FALLBACK_SUFFIX)).exists():
+            return pd.read_pickle(fallback_path)[nm]
+        return pd.read_parquet(self._column_path(nm))[nm]
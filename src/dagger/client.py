@@ -0,0 +1,48 @@
+"""
+Client for a DAG served via `dagger serve`
+"""
+import json
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pandas as pd
+
+from .utils.ipc import CONTENT_TYPE, from_ipc, to_ipc
+
+
+class DagClient:
+    """
+    Apply a remotely served DAG to data
+
+    Usage:
+    ------
+    client = DagClient('http://127.0.0.1:8642')
+    client.apply(data)
+    """
+    def __init__(self, url: str, timeout: float = 60.):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+
+    def _request(self, path: str, body: bytes = None) -> bytes:
+        request = Request(f'{self.url}{path}', data=body)
+        if body is not None:
+            request.add_header('Content-Type', CONTENT_TYPE)
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return response.read()
+        except HTTPError as e:
+            message = e.read().decode()
+            if e.code == 400:
+                raise ValueError(message) from e
+            raise RuntimeError(f'Server error ({e.code}): {message}') from e
+
+
+    def plan(self) -> dict:
+        """ Get initial nodes and execution plan of served DAG """
+        return json.loads(self._request('/plan'))
+
+
+    def apply(self, data: pd.DataFrame) -> pd.DataFrame:
+        """ Apply served transformations to data """
+        return from_ipc(self._request('/apply', to_ipc(data)))
@@ -1,6 +1,8 @@
 import logging
+import time
+from inspect import signature
 from pathlib import Path
-from typing import Dict, Callable, List, Union
+from typing import Dict, Callable, List, Optional, Tuple, Type, Union
 
 import dask.dataframe as dd
 import networkx as nx
@@ -8,10 +10,12 @@ import pandas as pd
 from networkx.algorithms import dag
 from networkx.readwrite.json_graph import node_link_data, node_link_graph
 
+from .checkpoint import CheckpointStore, fingerprint_data
+from .grouping import Grouping
 from .utils.importer import extract_module_functions
 from .utils.type_checker import check_type
 
-from .node import VariableNode, FunctionSignatureTuple
+from .node import MultiOutputNode, VariableNode, FunctionSignatureTuple
 
 DEFAULT_DASK_CHUNKSIZE = 10000
 
@@ -34,10 +38,25 @@ class DagExecutor:
     def __init__(self,
                  use_dask: bool = False,
                  dask_chunksize: int = DEFAULT_DASK_CHUNKSIZE,
-                 allow_undeclared_vars: bool = True):
+                 allow_undeclared_vars: bool = True,
+                 checkpoint_dir: Optional[Union[str, Path]] = None,
+                 max_retries: int = 0,
+                 retry_delay: float = 0.,
+                 retry_on: Tuple[Type[Exception], ...] = (Exception,)):
+        if use_dask and checkpoint_dir is not None:
+            raise ValueError('Checkpointing is not supported with dask')
+        if use_dask and max_retries > 0:
+            # Dask errors are raised on compute, outside of node evaluation
+            raise ValueError('Retries are not supported with dask')
+        if max_retries < 0:
+            raise ValueError('max_retries must be non-negative')
         self.allow_undeclared_vars = allow_undeclared_vars
         self.use_dask = use_dask
         self.dask_chunksize = dask_chunksize
+        self.checkpoint_dir = checkpoint_dir
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.retry_on = retry_on
         self._graph = nx.DiGraph()
         self._is_planned = False
 
@@ -57,6 +76,9 @@ class DagExecutor:
             return self._graph.add_node(node.name, data=node)
 
         existing_node = self[node.name]
+        if isinstance(node, MultiOutputNode) or isinstance(existing_node, MultiOutputNode):
+            raise ValueError(f'{node.name} is a multi-output function, and cannot also be '
+                             'used as a variable. Depend on its outputs instead.')
         existing_node.check_for_update(node)
 
 
@@ -69,6 +91,10 @@ class DagExecutor:
             # parent nodes will always be incomplete
             self._add_or_update_node(parent)
             self._graph.add_edge(parent.name, func_info.node.name)
+        for child in func_info.children:
+            # child nodes are computed by func node
+            self._add_or_update_node(child)
+            self._graph.add_edge(func_info.node.name, child.name)
 
 
     def add_functions(self, funcs: Dict[str, Callable]):
@@ -123,6 +149,8 @@ class DagExecutor:
             node = self[nm]
             if not node.is_complete:
                 initial_nodes.add(node.name)
+            elif isinstance(node.body, MultiOutputNode):
+                continue  # Computed along with its multi-output parent
             else:
                 execution_plan.append(node)
 
@@ -147,22 +175,95 @@ class DagExecutor:
             check_type(data[nm], node.dtype)
 
 
-    def apply(self, data: pd.DataFrame) -> pd.DataFrame:
-        """ Apply planned transformations to data """
+    def _grouping(self, data: pd.DataFrame, key: str, cache: dict) -> Grouping:
+        """ Get grouping of :key:, factorizing once per key """
+        if key not in cache:
+            cache[key] = Grouping(data[key])
+        return cache[key]
+
+
+    def _evaluate_node(self, node: VariableNode, data: pd.DataFrame,
+                       group_cache: dict) -> Dict[str, pd.Series]:
+        """ Compute all outputs of node, evaluating per group if node is grouped """
+        depends = self._graph.predecessors(node.name)
+        if node.group_by is not None and node.group_by not in signature(node.body).parameters:
+            depends = (n for n in depends if n != node.group_by)
+        input_values = {n: data[n] for n in depends}
+
+        if node.group_by is None:
+            return {nm: pd.Series(value) for nm, value in node.evaluate(**input_values).items()}
+
+        grouping = self._grouping(data, node.group_by, group_cache)
+        if node.group_vectorized:
+            result = node.evaluate(**grouping.group_inputs(input_values))
+            return {nm: grouping.align(value) for nm, value in result.items()}
+
+        results = {nm: [] for nm in node.output_names}
+        for group_values in grouping.split_inputs(input_values):
+            for nm, value in node.evaluate(**group_values).items():
+                results[nm].append(value)
+        return {nm: grouping.combine(values) for nm, values in results.items()}
+
+
+    def _call_node(self, node: VariableNode, data: pd.DataFrame,
+                   group_cache: dict) -> Dict[str, pd.Series]:
+        """ Evaluate node, retrying on configured transient errors """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._evaluate_node(node, data, group_cache)
+            except self.retry_on as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f'Node {node.name} failed on attempt {attempt + 1} '
+                               f'({e!r}). Retrying...')
+                time.sleep(self.retry_delay)
+
+
+    def apply(self, data: pd.DataFrame, resume: bool = False) -> pd.DataFrame:
+        """ Apply planned transformations to data
+
+        If a checkpoint_dir is configured, each computed column is persisted as it
+        completes. With resume=True, previously completed columns are reloaded from the
+        checkpoint instead of being recomputed. """
         if not self._is_planned:
             raise ValueError('Must first run .plan()')
         if (missing := self.initial_nodes.difference(data)):
             raise ValueError(f'Data missing columns: {missing}')
+        if self.use_dask and any(node.group_by for node in self.execution_plan):
+            raise ValueError('Grouped nodes are not supported with dask')
 
         self._validate_data(data)
+
+        store = None
+        completed = set()
+        if self.checkpoint_dir is not None:
+            store = CheckpointStore(self.checkpoint_dir)
+            plan = [nm for node in self.execution_plan for nm in node.output_names]
+            fingerprint = fingerprint_data(data, self.initial_nodes)
+            if resume:
+                completed = store.resume(plan, fingerprint)
+            else:
+                store.start(plan, fingerprint)
+        elif resume:
+            raise ValueError('Cannot resume without a checkpoint_dir')
+
         if self.use_dask:
             data = dd.from_pandas(data, chunksize=self.dask_chunksize)
 
+        # Groupings are shared by all grouped nodes with the same key:
+        group_cache = {}
         for node in self.execution_plan:
-            depends = self._graph.predecessors(node.name)
-            input_values = {n: data[n] for n in depends}
-            node_value = node(**input_values)
-            data[node.name] = pd.Series(node_value)
+            if completed.issuperset(node.output_names):
+                logger.info(f'Loading checkpointed node {node.name}...')
+                for nm in node.output_names:
+                    # Fingerprint guarantees the same index and row order, so assign by position:
+                    data[nm] = store.load(nm).set_axis(data.index)
+                continue
+
+            for nm, value in self._call_node(node, data, group_cache).items():
+                data[nm] = value
+                if store is not None:
+                    store.save(nm, data[nm])
 
         if self.use_dask:
             data = data.compute()
@@ -0,0 +1,106 @@
+"""
+Shared grouping of data by a key, used to evaluate grouped nodes
+"""
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from pandas.core.groupby import SeriesGroupBy
+
+
+class Grouping:
+    """
+    A single factorization of a grouping key, shared by all grouped nodes with that key
+
+    Rows are sorted by group once, and inputs split into groups are cached by name, so
+    that nodes sharing a key and inputs reuse both the factorization and the slices.
+    Outputs are assembled positionally, so the data index is never used for alignment.
+    Rows with a missing key do not belong to any group, and have missing outputs.
+
+    Usage:
+    ------
+    grouping = Grouping(data['g'])
+    results = [func(**group_values) for group_values in grouping.split_inputs(inputs)]
+    grouping.combine(results)
+    """
+    def __init__(self, key_values: pd.Series):
+        self.index = key_values.index
+        self.codes, uniques = pd.factorize(key_values)
+        self.ngroups = len(uniques)
+        self.n_rows = len(self.codes)
+
+        # Positions of rows belonging to a group, sorted by group:
+        order = np.argsort(self.codes, kind='stable')
+        self.positions = order[self.codes[order] >= 0]
+        self.counts = np.bincount(self.codes[self.positions], minlength=self.ngroups)
+        self._bounds = np.concatenate([[0], np.cumsum(self.counts)])
+        self._categories = pd.Categorical.from_codes(self.codes, categories=np.arange(self.ngroups))
+        self._splits = {}
+
+
+    def _split(self, nm: str, values: pd.Series) -> List[pd.Series]:
+        """ Split values into groups, caching by input name """
+        if nm not in self._splits:
+            sorted_values = values.take(self.positions)
+            self._splits[nm] = [
+                sorted_values.iloc[start:stop]
+                for start, stop in zip(self._bounds[:-1], self._bounds[1:])
+            ]
+        return self._splits[nm]
+
+
+    def split_inputs(self, inputs: Dict[str, pd.Series]) -> List[Dict[str, pd.Series]]:
+        """ Split each input into groups, returning a mapping of input to values per group """
+        splits = {nm: self._split(nm, values) for nm, values in inputs.items()}
+        return [
+            {nm: split[i] for nm, split in splits.items()}
+            for i in range(self.ngroups)
+        ]
+
+
+    def group_inputs(self, inputs: Dict[str, pd.Series]) -> Dict[str, SeriesGroupBy]:
+        """ Group each input by the shared factorization, for vectorized evaluation """
+        return {
+            nm: values.groupby(self._categories, observed=True, sort=True)
+            for nm, values in inputs.items()
+        }
+
+
+    def _scatter(self, values: np.ndarray) -> pd.Series:
+        """ Assign values ordered by group back to their row positions """
+        if len(self.positions) == self.n_rows:
+            out = np.empty(self.n_rows, dtype=values.dtype)
+        else:
+            dtype = np.result_type(values.dtype, float) if values.dtype.kind in 'biuf' else object
+            out = np.full(self.n_rows, np.nan, dtype=dtype)
+        out[self.positions] = values
+        return pd.Series(out, index=self.index)
+
+
+    def combine(self, results: List[Any]) -> pd.Series:
+        """ Combine per-group results, each a scalar or values aligned with its group """
+        if all(np.ndim(value) == 0 for value in results):
+            return self._scatter(np.repeat(np.asarray(results), self.counts))
+
+        pieces = []
+        for value, count in zip(results, self.counts):
+            if np.ndim(value) == 0:
+                pieces.append(np.full(count, value))
+            elif len(value) != count:
+                raise ValueError(f'Grouped function returned {len(value)} values '
+                                 f'for a group of {count} rows')
+            else:
+                pieces.append(np.asarray(value))
+        return self._scatter(np.concatenate(pieces))
+
+
+    def align(self, value) -> pd.Series:
+        """ Align a vectorized result, either per row or an aggregate per group """
+        if len(value) == self.n_rows:
+            if isinstance(value, pd.Series):
+                return value.set_axis(self.index)
+            return pd.Series(np.asarray(value), index=self.index)
+        if len(value) == self.ngroups:
+            return self._scatter(np.asarray(value)[self.codes[self.positions]])
+        raise ValueError(f'Grouped function returned {len(value)} values, expected '
+                         f'{self.n_rows} rows or {self.ngroups} groups')
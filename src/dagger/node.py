@@ -1,14 +1,47 @@
 import logging
 from dataclasses import dataclass, field
 from inspect import signature, Signature
-from typing import Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from .utils.type_checker import check_type
 
 
+GROUP_BY_ATTR = '__dagger_group_by__'
+GROUP_VECTORIZED_ATTR = '__dagger_group_vectorized__'
+
 logger = logging.getLogger(__name__)
 
 
+def group_by(key: str, vectorized: bool = False) -> Callable:
+    """ Decorate a transform function to be evaluated per group of :key:
+
+    By default, the function is called on the rows of each group and returns either a
+    scalar (broadcast to the group) or values positionally aligned with the group.
+
+    If vectorized, the function is called once, with each input as a SeriesGroupBy
+    sharing a single grouping of :key:. It returns either an aggregate per group
+    (e.g. a.mean(), broadcast to each group) or values aligned with the data
+    (e.g. a.transform('mean') or a.rank()). """
+    def decorator(func: Callable) -> Callable:
+        setattr(func, GROUP_BY_ATTR, key)
+        setattr(func, GROUP_VECTORIZED_ATTR, vectorized)
+        return func
+    return decorator
+
+
+def _resolve_return_annotation(func: Callable, annotation):
+    """ Evaluate string (postponed) return annotations, e.g. from __future__ annotations """
+    if not isinstance(annotation, str):
+        return annotation
+    try:
+        return eval(annotation, getattr(func, '__globals__', {}))
+    except Exception as e:
+        if annotation.lstrip().startswith('{'):
+            raise ValueError(f'Could not resolve outputs of {func.__name__}: '
+                             f'{annotation}') from e
+        return annotation
+
+
 @dataclass
 class VariableNode:
     """ Representation of a variable in a DAG
@@ -18,6 +51,8 @@ class VariableNode:
     name: str
     dtype: Optional[type] = None
     body: Optional[Callable] = None
+    group_by: Optional[str] = None
+    group_vectorized: bool = False
     is_complete: bool = field(init=False)
 
     def __post_init__(self):
@@ -58,8 +93,19 @@ class VariableNode:
         return result
 
 
+    @property
+    def output_names(self) -> List[str]:
+        """ Names of variables computed by node """
+        return [self.name]
+
+
+    def evaluate(self, *args, **kwargs) -> Dict[str, Any]:
+        """ Call node, returning a mapping of output name to value """
+        return {self.name: self(*args, **kwargs)}
+
+
     def _keys(self):
-        return (self.name, self.dtype, self.body)
+        return (self.name, self.dtype, self.body, self.group_by, self.group_vectorized)
 
 
     def __eq__(self, other):
@@ -68,25 +114,98 @@ class VariableNode:
         return self._keys() == other._keys()
 
 
+@dataclass(eq=False)
+class MultiOutputNode(VariableNode):
+    """ Representation of a function computing several variables in a single pass
+
+    Outputs are declared as a mapping of variable name to type, e.g. via the return
+    annotation of the function. The function may return a tuple ordered as the outputs,
+    or a mapping (such as a dict or DataFrame) keyed by output name.
+    """
+    outputs: Dict[str, Optional[type]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.outputs = {
+            nm: (None if dtype is Signature.empty else dtype)
+            for nm, dtype in self.outputs.items()
+        }
+
+
+    def __call__(self, *args, **kwargs) -> Dict[str, Any]:
+        if not self.is_complete:
+            raise ValueError('Can\'t call incomplete node')
+        result = self.body(*args, **kwargs)
+        if isinstance(result, tuple):
+            if len(result) != len(self.outputs):
+                raise ValueError(f'Node {self.name} returned {len(result)} values, '
+                                 f'expected {len(self.outputs)}')
+            result = dict(zip(self.outputs, result))
+        if (missing := set(self.outputs).difference(result)):
+            raise ValueError(f'Node {self.name} is missing outputs: {missing}')
+
+        values = {}
+        for nm, dtype in self.outputs.items():
+            check_type(result[nm], dtype)
+            values[nm] = result[nm]
+        return values
+
+
+    @property
+    def output_names(self) -> List[str]:
+        return list(self.outputs)
+
+
+    def evaluate(self, *args, **kwargs) -> Dict[str, Any]:
+        return self(*args, **kwargs)
+
+
+    def _keys(self):
+        return (*super()._keys(), tuple(self.outputs.items()))
+
+
 @dataclass
 class FunctionSignatureTuple:
     """ Representation of variable nodes generated by a single function
 
-    The function output is a VariableNode, and its inputs are a list of VariableNode(s)
+    The function output is a VariableNode, and its inputs are a list of VariableNode(s).
+    Functions declaring multiple outputs (via a dict return annotation) are instead
+    represented by a MultiOutputNode, with its outputs as a list of children VariableNode(s)
     """
     node: VariableNode
     parents: List[VariableNode]
+    children: List[VariableNode] = field(default_factory=list)
 
 
     @classmethod
     def from_signature(cls, func):
         sig = signature(func)
-        node = VariableNode(name=func.__name__,
-                            dtype=sig.return_annotation,
-                            body=func)
+        return_annotation = _resolve_return_annotation(func, sig.return_annotation)
+        group_key = getattr(func, GROUP_BY_ATTR, None)
+        group_vectorized = getattr(func, GROUP_VECTORIZED_ATTR, False)
+        if isinstance(return_annotation, dict):
+            node = MultiOutputNode(name=func.__name__,
+                                   body=func,
+                                   group_by=group_key,
+                                   group_vectorized=group_vectorized,
+                                   outputs=return_annotation)
+            # Children are computed by their parent node:
+            children = [
+                VariableNode(name=nm, dtype=dtype, body=node)
+                for nm, dtype in node.outputs.items()
+            ]
+        else:
+            node = VariableNode(name=func.__name__,
+                                dtype=return_annotation,
+                                body=func,
+                                group_by=group_key,
+                                group_vectorized=group_vectorized)
+            children = []
         parents = [
             VariableNode(name=pnm, dtype=param.annotation, body=None)
             for pnm, param in sig.parameters.items()
         ]
+        if group_key is not None and group_key not in sig.parameters:
+            parents.append(VariableNode(name=group_key, body=None))
 
-        return cls(node=node, parents=parents)
+        return cls(node=node, parents=parents, children=children)
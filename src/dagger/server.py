@@ -0,0 +1,218 @@
+"""
+Serve a planned DAG from a warm process, applying it to DataFrames sent over HTTP
+
+Requests and responses are DataFrames encoded in Arrow IPC stream format:
+    POST /apply  Apply planned transformations to the request DataFrame
+    GET /plan    Describe initial nodes and execution plan as JSON
+"""
+import json
+import logging
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+import pandas as pd
+
+from .dag import DagExecutor
+from .utils.ipc import CONTENT_TYPE, from_ipc, to_ipc
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8642
+DEFAULT_REQUEST_TIMEOUT = 300.
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingApplier:
+    """
+    Applies a planned DagExecutor on a worker pool, optionally batching requests
+
+    Requests arriving within batch_timeout seconds of each other (up to max_batch_size,
+    and sharing the same columns) are concatenated and applied in a single pass.
+    Batching is only valid for row-wise transforms: functions aggregating over a column
+    (e.g. a.mean()) will see the whole batch rather than a single request.
+
+    Usage:
+    ------
+    applier = BatchingApplier(executor, n_workers=4, max_batch_size=16)
+    result = applier.submit(data).result()
+    applier.close()
+    """
+    def __init__(self,
+                 executor: DagExecutor,
+                 n_workers: int = 1,
+                 max_batch_size: int = 1,
+                 batch_timeout: float = 0.01):
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be positive')
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout
+        self._pool = ThreadPoolExecutor(max_workers=n_workers)
+        self._queue = queue.Queue()
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+
+    def submit(self, data: pd.DataFrame) -> Future:
+        """ Queue data to be applied, returning a future of the result """
+        future = Future()
+        self._queue.put((data, future))
+        return future
+
+
+    def _collect_batch(self) -> List[Tuple[pd.DataFrame, Future]]:
+        """ Block for a request, then gather any further requests arriving in time """
+        batch = [self._queue.get()]
+        while batch[-1] is not None and len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get(timeout=self.batch_timeout))
+            except queue.Empty:
+                break
+        return batch
+
+
+    def _dispatch(self):
+        while True:
+            batch = self._collect_batch()
+            is_closed = batch[-1] is None
+            requests = batch[:-1] if is_closed else batch
+
+            by_columns = {}
+            for data, future in requests:
+                by_columns.setdefault(tuple(data.columns), []).append((data, future))
+            for group in by_columns.values():
+                self._pool.submit(self._apply_batch, group)
+
+            if is_closed:
+                return
+
+
+    def _apply_batch(self, batch: List[Tuple[pd.DataFrame, Future]]):
+        """ Apply executor to concatenated batch, then split results by request
+
+        If a batch fails, each request is retried alone, so that a single bad request
+        does not fail the others. Every future is always resolved. """
+        try:
+            frames = [data for data, _ in batch]
+            result = self.executor.apply(pd.concat(frames, ignore_index=True))
+            results = []
+            start = 0
+            for data in frames:
+                stop = start + len(data)
+                results.append(result.iloc[start:stop].set_axis(data.index))
+                start = stop
+        except Exception as e:
+            if len(batch) > 1:
+                logger.warning(f'Batch of {len(batch)} requests failed ({e!r}). '
+                               'Retrying requests individually...')
+                for item in batch:
+                    self._apply_batch([item])
+            else:
+                batch[0][1].set_exception(e)
+            return
+
+        for (_, future), data in zip(batch, results):
+            future.set_result(data)
+
+
+    def close(self):
+        """ Finish queued requests and shut down workers """
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True)
+
+
+class _DagRequestHandler(BaseHTTPRequestHandler):
+    """ Route HTTP requests to the server's applier """
+    def _respond(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def _respond_error(self, status: int, e: Exception):
+        self._respond(status, str(e).encode(), 'text/plain')
+
+
+    def do_GET(self):
+        if self.path != '/plan':
+            return self._respond_error(404, ValueError(f'Unknown path: {self.path}'))
+        executor = self.server.applier.executor
+        body = json.dumps({
+            'initial_nodes': sorted(executor.initial_nodes),
+            'execution_plan': [node.name for node in executor.execution_plan],
+        })
+        self._respond(200, body.encode(), 'application/json')
+
+
+    def do_POST(self):
+        if self.path != '/apply':
+            return self._respond_error(404, ValueError(f'Unknown path: {self.path}'))
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            data = from_ipc(self.rfile.read(length))
+        except Exception as e:
+            return self._respond_error(400, e)
+
+        try:
+            result = self.server.applier.submit(data).result(timeout=self.server.request_timeout)
+        except TimeoutError:
+            return self._respond_error(504, TimeoutError(
+                f'Request timed out after {self.server.request_timeout}s'))
+        except ValueError as e:
+            return self._respond_error(400, e)
+        except Exception as e:
+            logger.exception('Failed to apply DAG')
+            return self._respond_error(500, e)
+        self._respond(200, to_ipc(result), CONTENT_TYPE)
+
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class DagServer(ThreadingHTTPServer):
+    """
+    HTTP server applying a planned DagExecutor to Arrow IPC encoded DataFrames
+
+    Scripts are imported and planned once, on construction.
+
+    Usage:
+    ------
+    server = DagServer('path/to/script/', port=0)
+    server.serve_forever()
+    """
+    daemon_threads = True
+
+    def __init__(self,
+                 scripts,
+                 host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT,
+                 n_workers: int = 1,
+                 max_batch_size: int = 1,
+                 batch_timeout: float = 0.01,
+                 request_timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        self.request_timeout = request_timeout
+        executor = DagExecutor().add_function_scripts(scripts).plan()
+        self.applier = BatchingApplier(executor,
+                                       n_workers=n_workers,
+                                       max_batch_size=max_batch_size,
+                                       batch_timeout=batch_timeout)
+        super().__init__((host, port), _DagRequestHandler)
+
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+    def server_close(self):
+        super().server_close()
+        self.applier.close()
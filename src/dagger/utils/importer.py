@@ -28,9 +28,17 @@ def _split_path(path: Path) -> Tuple[str, str]:
     return str(path.parent), path.stem
 
 
+def _is_dagger_helper(func: Callable) -> bool:
+    """ Whether function is imported from dagger itself, e.g. the group_by decorator """
+    return (func.__module__ or '').split('.')[0] == 'dagger'
+
+
 def _get_module_funcs(mod) -> Dict[str, Callable]:
-    """ Get functions from module """
-    return dict(member for member in getmembers(mod, isfunction))
+    """ Get functions from module, excluding dagger helpers """
+    return {
+        nm: func for nm, func in getmembers(mod, isfunction)
+        if not _is_dagger_helper(func)
+    }
 
 
 def extract_module_functions(script: Union[str, Path]) -> Dict[str, Callable]:
@@ -0,0 +1,22 @@
+"""
+Utilities to serialize DataFrames in Arrow IPC stream format
+"""
+import pandas as pd
+import pyarrow as pa
+
+
+CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+def to_ipc(data: pd.DataFrame) -> bytes:
+    """ Serialize DataFrame (including its index) to Arrow IPC stream bytes """
+    table = pa.Table.from_pandas(data)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def from_ipc(payload: bytes) -> pd.DataFrame:
+    """ Deserialize Arrow IPC stream bytes to DataFrame """
+    return pa.ipc.open_stream(payload).read_pandas()
@@ -0,0 +1,38 @@
+# This script is to be read in as text and processed!
+# It exercises multi-output and grouped nodes
+import pandas as pd
+
+from dagger.node import group_by
+
+
+def a_scaled(a: float) -> {'a_centered': float, 'a_normed': float}:
+    return a - a.mean(), a / a.max()
+
+
+def a_ratio(a_centered, a_normed):
+    return a_centered / a_normed
+
+
+@group_by('g')
+def a_group_mean(a: float) -> float:
+    return a.mean()
+
+
+@group_by('g')
+def a_group_stats(a: float, b: float) -> {'a_group_rank': float, 'b_group_sum': float}:
+    return {'a_group_rank': a.rank(), 'b_group_sum': b.sum()}
+
+
+TEST_DATA = pd.DataFrame({
+    'a': [1., 2., 3., 4.],
+    'b': [1., 1., 2., 2.],
+    'g': ['x', 'y', 'x', 'y'],
+})
+EXPECTED_OUTPUT = TEST_DATA.assign(
+    a_centered=[-1.5, -.5, .5, 1.5],
+    a_normed=[.25, .5, .75, 1.],
+    a_ratio=[-6., -1., 2 / 3, 1.5],
+    a_group_mean=[2., 3., 2., 3.],
+    a_group_rank=[1., 1., 2., 2.],
+    b_group_sum=[3., 3., 3., 3.],
+)
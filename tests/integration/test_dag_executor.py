@@ -4,6 +4,7 @@ from pandas.testing import assert_frame_equal
 from dagger.__main__ import plan_apply_dag
 
 from samples import boston_housing_run
+from tests.fixtures import multi_output_script
 from tests.fixtures.transform_script import TEST_DATA, EXPECTED_OUTPUT
 
 
@@ -15,6 +16,14 @@ def test_execute_transform_script(use_dask):
     assert_frame_equal(result[EXPECTED_OUTPUT.columns], EXPECTED_OUTPUT)
 
 
+def test_execute_multi_output_script():
+    expected = multi_output_script.EXPECTED_OUTPUT
+    result = plan_apply_dag('tests.fixtures.multi_output_script',
+                            multi_output_script.TEST_DATA.copy())
+    assert set(result) == set(expected)
+    assert_frame_equal(result[expected.columns], expected)
+
+
 def test_sample_scripts_boston():
     result = boston_housing_run.main()
     assert result.shape == (506, 20)  # Very simple ad hoc check. Could be better
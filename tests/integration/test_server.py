@@ -0,0 +1,65 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from dagger.client import DagClient
+from dagger.server import DagServer
+
+from tests.fixtures.transform_script import TEST_DATA, EXPECTED_OUTPUT
+
+
+@pytest.fixture(params=[1, 8], ids=['unbatched', 'batched'])
+def client(request):
+    server = DagServer('tests.fixtures.transform_script', port=0, n_workers=2,
+                       max_batch_size=request.param)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield DagClient(server.url)
+    server.shutdown()
+    server.server_close()
+
+
+def test_apply(client):
+    result = client.apply(TEST_DATA)
+    assert_frame_equal(result[EXPECTED_OUTPUT.columns], EXPECTED_OUTPUT)
+
+
+def test_apply_concurrent_requests(client):
+    requests = [
+        pd.DataFrame({'a': [i], 'b': [2], 'c': [3]}, index=[i]) for i in range(16)
+    ]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(client.apply, requests))
+    for data, result in zip(requests, results):
+        assert_frame_equal(result[list(data)], data)
+        assert (result['var1'] == data['a'] + data['b']).all()
+
+
+def test_apply_missing_columns(client):
+    with pytest.raises(ValueError):
+        client.apply(TEST_DATA[['a']])
+
+
+def test_apply_timeout():
+    class SlowExecutor:
+        def apply(self, data):
+            time.sleep(1)
+            return data
+
+    server = DagServer('tests.fixtures.transform_script', port=0, request_timeout=0.1)
+    server.applier.executor = SlowExecutor()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with pytest.raises(RuntimeError, match='504'):
+        DagClient(server.url).apply(TEST_DATA)
+    server.shutdown()
+    server.server_close()
+
+
+def test_plan(client):
+    plan = client.plan()
+    assert plan['initial_nodes'] == ['a', 'b', 'c']
+    assert set(plan['execution_plan']) == {'var0', 'var1', 'var2', 'var3'}
@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from dagger.server import BatchingApplier
+
+
+class CountingExecutor:
+    """ Stands in for a planned DagExecutor, recording batch sizes """
+    def __init__(self):
+        self.batch_sizes = []
+
+    def apply(self, data):
+        self.batch_sizes.append(len(data))
+        return data.assign(x=data['a'] * 2)
+
+
+def test_batches_requests():
+    executor = CountingExecutor()
+    applier = BatchingApplier(executor, max_batch_size=4, batch_timeout=1.)
+    futures = [applier.submit(pd.DataFrame({'a': [i]}, index=[i])) for i in range(4)]
+    results = [future.result() for future in futures]
+    applier.close()
+
+    assert executor.batch_sizes == [4]
+    for i, result in enumerate(results):
+        assert list(result.index) == [i]
+        assert result['x'].item() == i * 2
+
+
+def test_does_not_batch_mismatched_columns():
+    executor = CountingExecutor()
+    applier = BatchingApplier(executor, max_batch_size=2, batch_timeout=1.)
+    futures = [applier.submit(pd.DataFrame({'a': [1]})),
+               applier.submit(pd.DataFrame({'a': [1], 'b': [2]}))]
+    for future in futures:
+        future.result()
+    applier.close()
+
+    assert executor.batch_sizes == [1, 1]
+
+
+def test_propagates_errors():
+    applier = BatchingApplier(CountingExecutor())
+    future = applier.submit(pd.DataFrame({'b': [1]}))
+    with pytest.raises(KeyError):
+        future.result()
+    applier.close()
+
+
+def test_retries_failed_batch_individually():
+    class RejectingExecutor(CountingExecutor):
+        def apply(self, data):
+            self.batch_sizes.append(len(data))
+            if (data['a'] < 0).any():
+                raise ValueError('Negative values')
+            return data.assign(x=data['a'] * 2)
+
+    executor = RejectingExecutor()
+    applier = BatchingApplier(executor, max_batch_size=2, batch_timeout=1.)
+    good = applier.submit(pd.DataFrame({'a': [1]}))
+    bad = applier.submit(pd.DataFrame({'a': [-1]}))
+    assert good.result(timeout=5)['x'].item() == 2
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+    applier.close()
+
+    assert executor.batch_sizes == [2, 1, 1]
+
+
+def test_resolves_futures_when_split_fails():
+    class TruncatingExecutor:
+        def apply(self, data):
+            return data.iloc[:0]
+
+    applier = BatchingApplier(TruncatingExecutor())
+    future = applier.submit(pd.DataFrame({'a': [1]}))
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+    applier.close()
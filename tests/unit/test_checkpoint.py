@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_series_equal
+
+from dagger.checkpoint import CheckpointStore, fingerprint_data
+
+
+PLAN = ['var1', 'var2']
+FINGERPRINT = 'abc'
+
+
+@pytest.fixture
+def store(tmp_path):
+    yield CheckpointStore(tmp_path / 'checkpoints')
+
+
+def test_save_and_load(store):
+    store.start(PLAN, FINGERPRINT)
+    value = pd.Series([1., 2., 3.], name='var1')
+    store.save('var1', value)
+    assert_series_equal(store.load('var1'), value)
+
+
+def test_save_falls_back_to_pickle(store):
+    store.start(PLAN, FINGERPRINT)
+    value = pd.Series([1, 'x', 2.5], name='var1')
+    store.save('var1', value)
+    assert_series_equal(store.load('var1'), value)
+    assert store.resume(PLAN, FINGERPRINT) == {'var1'}
+
+
+def test_save_skips_unpersistable_columns(store):
+    store.start(PLAN, FINGERPRINT)
+    store.save('var1', pd.Series([lambda: None]))
+    assert store.resume(PLAN, FINGERPRINT) == set()
+    assert not list(store.run_path.glob('var1.*'))
+
+
+def test_save_requires_start(store):
+    with pytest.raises(ValueError):
+        store.save('var1', pd.Series([1., 2., 3.]))
+
+
+def test_resume_returns_completed(store):
+    store.start(PLAN, FINGERPRINT)
+    store.save('var1', pd.Series([1., 2., 3.]))
+    assert CheckpointStore(store.path).resume(PLAN, FINGERPRINT) == {'var1'}
+
+
+def test_resume_without_manifest_starts_fresh(store):
+    assert store.resume(PLAN, FINGERPRINT) == set()
+    assert store.exists()
+
+
+def test_start_discards_previous_run(store):
+    store.start(PLAN, FINGERPRINT)
+    store.save('var1', pd.Series([1., 2., 3.]))
+    store.save('var2', pd.Series([1, 'x', 2.5]))
+    store.start(PLAN, FINGERPRINT)
+    assert store.resume(PLAN, FINGERPRINT) == set()
+    assert not list(store.run_path.glob('var*'))
+
+
+def test_start_keeps_unrelated_files(store):
+    store.path.mkdir()
+    unrelated = store.path / 'input_data.parquet'
+    pd.DataFrame({'a': [1]}).to_parquet(unrelated)
+    store.start(PLAN, FINGERPRINT)
+    store.save('var1', pd.Series([1., 2., 3.]))
+    store.start(PLAN, FINGERPRINT)
+    assert unrelated.exists()
+
+
+@pytest.mark.parametrize('plan,fingerprint', [
+    (['var2', 'var1'], FINGERPRINT),
+    (PLAN, 'def'),
+])
+def test_resume_raises_on_mismatch(store, plan, fingerprint):
+    store.start(PLAN, FINGERPRINT)
+    with pytest.raises(ValueError):
+        store.resume(plan, fingerprint)
+
+
+@pytest.mark.parametrize('other', [
+    pd.DataFrame({'a': [10, 20], 'b': [3, 4]}),
+    pd.DataFrame({'a': [1, 2], 'b': [3, 4]}, index=[5, 6]),
+    pd.DataFrame({'a': [2, 1], 'b': [4, 3]}, index=[1, 0]),
+])
+def test_fingerprint_data_detects_changes(other):
+    data = pd.DataFrame({'a': [1, 2], 'b': [3, 4]})
+    assert fingerprint_data(data, ['a']) == fingerprint_data(data.assign(c=0), ['a'])
+    assert fingerprint_data(data, ['a']) != fingerprint_data(other, ['a'])
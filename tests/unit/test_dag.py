@@ -1,9 +1,12 @@
+import pandas as pd
 import pytest
+from pandas.testing import assert_series_equal
 
 from dagger.dag import DagExecutor
-from dagger.node import VariableNode
+from dagger.node import VariableNode, group_by
 from dagger.utils.importer import extract_module_functions
 
+from tests.fixtures.data import mock_data
 from tests.fixtures.functions import typed_func, untyped_func
 
 
@@ -65,6 +68,18 @@ class TestAddFunctions:
         with pytest.raises(ValueError):
             ex.add_functions({'a1': a1, 'a2': a2})
 
+    @pytest.mark.parametrize('order', [['s', 't'], ['t', 's']])
+    def test_cant_depend_on_multi_output_function(self, order):
+        def s(a) -> {'s_min': float, 's_max': float}:
+            return a.min(), a.max()
+
+        def t(s):
+            return s
+
+        ex = DagExecutor()
+        with pytest.raises(ValueError):
+            ex.add_functions({nm: {'s': s, 't': t}[nm] for nm in order})
+
     def test_cant_add_if_already_planned(self, mock_funcs):
         ex = DagExecutor()
         ex.plan()
@@ -90,7 +105,156 @@ class TestPlan:
         # guaranteed to be stable!
         assert [node.name for node in ex.execution_plan] == ['var1', 'var2', 'var3', 'var0']
 
+    def test_multi_output_children_not_planned(self):
+        def stats(a) -> {'a_min': float, 'a_max': float}:
+            return a.min(), a.max()
+
+        ex = DagExecutor().add_functions({'stats': stats}).plan()
+        assert ex.initial_nodes == {'a'}
+        assert [node.name for node in ex.execution_plan] == ['stats']
+
 
 class TestApply:
     # This is really in the realm of integration test
-    pass
+    @pytest.fixture
+    def flaky_funcs(self):
+        calls = {'x1': 0, 'x2': 0}
+
+        def x1(a):
+            calls['x1'] += 1
+            return a + 1
+
+        def x2(x1):
+            calls['x2'] += 1
+            if calls['x2'] == 1:
+                raise RuntimeError('Transient error')
+            return x1 * 2
+
+        yield {'x1': x1, 'x2': x2}, calls
+
+    def test_retries_transient_errors(self, flaky_funcs, mock_data):
+        funcs, calls = flaky_funcs
+        ex = DagExecutor(max_retries=1).add_functions(funcs).plan()
+        result = ex.apply(mock_data)
+        assert calls['x2'] == 2
+        assert (result['x2'] == (mock_data['a'] + 1) * 2).all()
+
+    def test_raises_when_retries_exhausted(self, flaky_funcs, mock_data):
+        funcs, _ = flaky_funcs
+        ex = DagExecutor().add_functions(funcs).plan()
+        with pytest.raises(RuntimeError):
+            ex.apply(mock_data)
+
+    def test_resume_skips_completed_nodes(self, flaky_funcs, mock_data, tmp_path):
+        funcs, calls = flaky_funcs
+        ex = DagExecutor(checkpoint_dir=tmp_path).add_functions(funcs).plan()
+        with pytest.raises(RuntimeError):
+            ex.apply(mock_data.copy())
+        result = ex.apply(mock_data.copy(), resume=True)
+        assert calls == {'x1': 1, 'x2': 2}
+        assert (result['x2'] == (mock_data['a'] + 1) * 2).all()
+
+    def test_grouped_nodes(self, mock_data):
+        @group_by('g')
+        def a_mean(a):
+            return a.mean()
+
+        @group_by('g')
+        def b_rank(b):
+            return b.rank()
+
+        ex = DagExecutor().add_functions({'a_mean': a_mean, 'b_rank': b_rank}).plan()
+        data = mock_data.assign(g=mock_data.index % 3)
+        result = ex.apply(data)
+        assert_series_equal(result['a_mean'], data.groupby('g')['a'].transform('mean'),
+                            check_names=False)
+        assert_series_equal(result['b_rank'], data.groupby('g')['b'].rank(), check_names=False)
+
+    def test_grouped_nodes_factorize_once(self, mock_data, monkeypatch):
+        @group_by('g')
+        def a_mean(a):
+            return a.mean()
+
+        @group_by('g', vectorized=True)
+        def b_rank(b):
+            return b.rank()
+
+        factorize = pd.factorize
+        factorized = []
+        monkeypatch.setattr(pd, 'factorize',
+                            lambda values, **kwargs: factorized.append(values.name)
+                            or factorize(values, **kwargs))
+        ex = DagExecutor().add_functions({'a_mean': a_mean, 'b_rank': b_rank}).plan()
+        ex.apply(mock_data.assign(g=mock_data.index % 3))
+        assert factorized == ['g']
+
+    def test_grouped_nodes_assign_by_position(self, mock_data):
+        @group_by('g')
+        def a_rank(a):
+            return a.reset_index(drop=True).rank()
+
+        ex = DagExecutor().add_functions({'a_rank': a_rank}).plan()
+        data = mock_data.assign(g=mock_data.index % 3).set_axis([0] * len(mock_data))
+        result = ex.apply(data)
+        assert_series_equal(result['a_rank'], data.groupby('g')['a'].rank(), check_names=False)
+
+    def test_grouped_nodes_raise_on_misaligned_values(self, mock_data):
+        @group_by('g')
+        def a_head(a):
+            return a.head(1)
+
+        ex = DagExecutor().add_functions({'a_head': a_head}).plan()
+        with pytest.raises(ValueError):
+            ex.apply(mock_data.assign(g=mock_data.index % 3))
+
+    @pytest.mark.parametrize('body', [
+        lambda a: a.mean(),
+        lambda a: a.transform('mean'),
+    ])
+    def test_vectorized_grouped_nodes(self, mock_data, body):
+        def a_mean(a):
+            return body(a)
+
+        ex = DagExecutor().add_functions({'a_mean': group_by('g', vectorized=True)(a_mean)})
+        data = mock_data.assign(g=mock_data.index % 3)
+        result = ex.plan().apply(data)
+        assert_series_equal(result['a_mean'], data.groupby('g')['a'].transform('mean'),
+                            check_names=False)
+
+    def test_resume_raises_on_changed_data(self, flaky_funcs, mock_data, tmp_path):
+        funcs, _ = flaky_funcs
+        ex = DagExecutor(checkpoint_dir=tmp_path).add_functions(funcs).plan()
+        with pytest.raises(RuntimeError):
+            ex.apply(mock_data.copy())
+        with pytest.raises(ValueError):
+            ex.apply(mock_data.assign(a=mock_data['a'] + 1), resume=True)
+
+    def test_resume_raises_on_reordered_rows(self, flaky_funcs, mock_data, tmp_path):
+        funcs, _ = flaky_funcs
+        ex = DagExecutor(checkpoint_dir=tmp_path).add_functions(funcs).plan()
+        with pytest.raises(RuntimeError):
+            ex.apply(mock_data.copy())
+        with pytest.raises(ValueError):
+            ex.apply(mock_data.iloc[::-1].copy(), resume=True)
+
+    def test_checkpoint_mixed_type_column(self, mock_data, tmp_path):
+        def label(a):
+            return a.where(a > 1, 'low')
+
+        ex = DagExecutor(checkpoint_dir=tmp_path).add_functions({'label': label}).plan()
+        result = ex.apply(mock_data.copy())
+        resumed = ex.apply(mock_data.copy(), resume=True)
+        assert_series_equal(resumed['label'], result['label'])
+
+    def test_resume_requires_checkpoint_dir(self, mock_script_loc, mock_data):
+        ex = DagExecutor().add_function_scripts(mock_script_loc).plan()
+        with pytest.raises(ValueError):
+            ex.apply(mock_data, resume=True)
+
+    def test_checkpoint_unsupported_with_dask(self, tmp_path):
+        with pytest.raises(ValueError):
+            DagExecutor(use_dask=True, checkpoint_dir=tmp_path)
+
+    def test_retries_unsupported_with_dask(self):
+        with pytest.raises(ValueError):
+            DagExecutor(use_dask=True, max_retries=1)
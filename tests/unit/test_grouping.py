@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_series_equal
+
+from dagger.grouping import Grouping
+
+
+@pytest.fixture
+def grouping():
+    yield Grouping(pd.Series(['x', 'y', None, 'x'], index=[0, 0, 1, 1]))
+
+
+def test_split_inputs(grouping):
+    groups = grouping.split_inputs({'a': pd.Series([1, 2, 3, 4])})
+    assert [list(group['a']) for group in groups] == [[1, 4], [2]]
+
+
+def test_split_inputs_are_cached(grouping):
+    values = pd.Series([1, 2, 3, 4])
+    first = grouping.split_inputs({'a': values})
+    assert grouping.split_inputs({'a': values})[0]['a'] is first[0]['a']
+
+
+@pytest.mark.parametrize('results,expected', [
+    ([1., 2.], [1., 2., np.nan, 1.]),
+    ([np.array([1., 4.]), 2.], [1., 2., np.nan, 4.]),
+])
+def test_combine(grouping, results, expected):
+    assert_series_equal(grouping.combine(results), pd.Series(expected, index=[0, 0, 1, 1]))
+
+
+def test_combine_raises_on_misaligned_values(grouping):
+    with pytest.raises(ValueError):
+        grouping.combine([np.array([1.]), 2.])
+
+
+@pytest.mark.parametrize('value,expected', [
+    (pd.Series([1., 2.]), [1., 2., np.nan, 1.]),
+    (np.array([1., 2., 3., 4.]), [1., 2., 3., 4.]),
+])
+def test_align(grouping, value, expected):
+    assert_series_equal(grouping.align(value), pd.Series(expected, index=[0, 0, 1, 1]))
+
+
+def test_align_raises_on_unexpected_length(grouping):
+    with pytest.raises(ValueError):
+        grouping.align(np.array([1., 2., 3.]))
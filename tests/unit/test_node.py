@@ -2,7 +2,7 @@ from inspect import signature
 
 import pytest
 
-from dagger.node import FunctionSignatureTuple, VariableNode
+from dagger.node import FunctionSignatureTuple, MultiOutputNode, VariableNode, group_by
 
 from tests.fixtures.functions import untyped_func, typed_func
 
@@ -78,8 +78,69 @@ class TestVariableNode:
         assert untyped_node(a=1, b=2) == untyped_func(a=1, b=2)
 
 
+class TestMultiOutputNode:
+    @pytest.mark.parametrize('body', [
+        lambda a: (a + 1, a * 2),
+        lambda a: {'x': a + 1, 'y': a * 2},
+    ])
+    def test_call(self, body):
+        node = MultiOutputNode(name='func', body=body, outputs={'x': int, 'y': int})
+        assert node(a=1) == {'x': 2, 'y': 2}
+        assert node.output_names == ['x', 'y']
+
+    def test_eq_uses_keys(self):
+        def body(a):
+            return a, a
+
+        node = MultiOutputNode(name='func', body=body, outputs={'x': None, 'y': None})
+        other = MultiOutputNode(name='func', body=body, outputs={'x': None, 'y': None})
+        other.is_complete = False
+        assert node == other
+        assert node != MultiOutputNode(name='func', body=body, outputs={'x': None})
+
+    @pytest.mark.parametrize('body', [
+        lambda a: (a,),
+        lambda a: {'x': a},
+    ])
+    def test_call_raises_on_missing_outputs(self, body):
+        node = MultiOutputNode(name='func', body=body, outputs={'x': None, 'y': None})
+        with pytest.raises(ValueError):
+            node(a=1)
+
+
 class TestFunctionSignatureTuple:
     def test_from_signature(self, typed_func, typed_node):
         tup = FunctionSignatureTuple.from_signature(typed_func)
         assert tup.node == typed_node
-        assert tup.parents == [VariableNode('a', int), VariableNode('b', int)]
\ No newline at end of file
+        assert tup.parents == [VariableNode('a', int), VariableNode('b', int)]
+        assert tup.children == []
+
+    def test_from_signature_multi_output(self):
+        def func(a) -> {'x': int, 'y': None}:
+            return a, a
+
+        tup = FunctionSignatureTuple.from_signature(func)
+        assert isinstance(tup.node, MultiOutputNode)
+        assert tup.children == [VariableNode('x', int, tup.node), VariableNode('y', None, tup.node)]
+
+    def test_from_signature_string_annotation(self):
+        def func(a):
+            return a, a
+        func.__annotations__['return'] = "{'x': int, 'y': None}"
+
+        tup = FunctionSignatureTuple.from_signature(func)
+        assert isinstance(tup.node, MultiOutputNode)
+        assert tup.node.outputs == {'x': int, 'y': None}
+
+    def test_from_signature_unresolvable_outputs(self):
+        def func(a):
+            return a, a
+        func.__annotations__['return'] = "{'x': Undefined}"
+
+        with pytest.raises(ValueError):
+            FunctionSignatureTuple.from_signature(func)
+
+    def test_from_signature_grouped(self, typed_func):
+        tup = FunctionSignatureTuple.from_signature(group_by('g')(typed_func))
+        assert tup.node.group_by == 'g'
+        assert [parent.name for parent in tup.parents] == ['a', 'b', 'g']
@@ -24,3 +24,16 @@ def test_resolve_script_path(path):
 def test_extract_functions():
     result = extract_module_functions(TEST_SCRIPT_LOC)
     assert set(result) == TEST_SCRIPT_FUNCS
+
+
+def test_extract_functions_excludes_dagger_helpers():
+    result = extract_module_functions('tests.fixtures.multi_output_script')
+    assert 'group_by' not in result
+
+
+def test_extract_functions_keeps_imported_transforms(tmp_path):
+    (tmp_path / 'importer_shared_features.py').write_text(
+        'def age_bucket(age):\n    return age // 10\n')
+    script = tmp_path / 'importer_script.py'
+    script.write_text('from importer_shared_features import age_bucket\n')
+    assert set(extract_module_functions(script)) == {'age_bucket'}